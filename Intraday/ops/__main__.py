@@ -0,0 +1,5 @@
+# ops/__main__.py
+import sys
+from ops.cli import main
+
+sys.exit(main())
@@ -1,20 +1,31 @@
 from __future__ import annotations
+import argparse, os, sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
+if not __package__:   # run as a script
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.results_db import ResultsDB, code_version, data_hash, params_key
+from src.utils import read_csv_cached
+
 PROC = Path("data/processed")
 UNIV = Path("data/active_symbols.csv")
 
 CAPITAL = 60_000       # you said you’ll deploy 60k
 DAILY_STOP = 0.01      # 1% daily stop -> ₹600
 TCOST_BPS = 3          # round-trip ~3 bps as a placeholder
+QTY = 15
+STRATEGY = "signals_file"
+PARAM_DEFAULTS = {"qty_per_trade": QTY}   # filled in by query_results --params
+
 
 def load_signals(sym: str) -> pd.DataFrame:
     p = PROC / f"{sym}_signals.csv"
     if not p.exists():
         return pd.DataFrame()
-    df = pd.read_csv(p, parse_dates=["datetime"])
+    df = read_csv_cached(p, parse_dates=["datetime"])
     return df.sort_values("datetime")
 
 def backtest_symbol(df: pd.DataFrame, qty_per_trade: int = 15) -> pd.DataFrame:
@@ -72,7 +83,11 @@ def metrics(df: pd.DataFrame) -> dict:
         "max_drawdown": round(float(mdd), 2),
     }
 
-def main():
+def current_code_version() -> str:
+    return code_version(backtest_symbol, metrics, CAPITAL=CAPITAL, DAILY_STOP=DAILY_STOP, TCOST_BPS=TCOST_BPS)
+
+def main(argv=None, prog=None):
+    argparse.ArgumentParser(prog=prog, description="Backtest saved signals for the active universe.").parse_args(argv)
     if not UNIV.exists():
         print("[WARN] run universe builder first"); return
     syms = pd.read_csv(UNIV)["symbol"].tolist()
@@ -83,15 +98,32 @@ def main():
     OUT = Path("data/processed/equity_curves")
     OUT.mkdir(parents=True, exist_ok=True)
 
+    db = ResultsDB()
+    code = current_code_version()
+    params = {"qty_per_trade": QTY}
     for s in syms:
         sig = load_signals(s)
         if sig.empty:
             print(f"[WARN] no signals for {s}"); continue
-        bt = backtest_symbol(sig, qty_per_trade=15)
-        m = metrics(bt); m["symbol"] = s
+        dhash = data_hash(sig)
+        eq_csv = OUT / f"{s}_equity.csv"
+        m = db.get(s, dhash, STRATEGY, params, code)
+        # reuse only if the curve on disk was written from this same result
+        out_key = f"{dhash}:{code}:{params_key(params)}"
+        if m is not None and db.output_matches(eq_csv, out_key):
+            m["symbol"] = s
+            summary.append(m)
+            print(f"[SKIP] {s}: cached {m}")
+            continue
+        bt = backtest_symbol(sig, qty_per_trade=QTY)
+        m = metrics(bt)
+        db.put(s, dhash, STRATEGY, params, code, m, data=sig)
+        m["symbol"] = s
         summary.append(m)
-        bt[["datetime","eq","pnl"]].to_csv(OUT / f"{s}_equity.csv", index=False)
+        bt[["datetime","eq","pnl"]].to_csv(eq_csv, index=False)
+        db.set_output(eq_csv, out_key)
         print(f"[OK] {s}: {m}")
+    db.close()
 
     if summary:
         pd.DataFrame(summary).to_csv(OUT / "summary.csv", index=False)
@@ -1,10 +1,21 @@
 # ops/build_universe.py
+import argparse, os, sys
+
+if not __package__:   # run as a script
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 from src.universe import build_universe
 
-if __name__ == "__main__":
-    u = build_universe(top_n=6)
+def main(argv=None, prog=None):
+    p = argparse.ArgumentParser(prog=prog, description="Rank raw symbols by turnover/range and write active_symbols.csv.")
+    p.add_argument("--top-n", type=int, default=6)
+    args = p.parse_args(argv)
+    u = build_universe(top_n=args.top_n)
     if u.empty:
         print("[WARN] No raw data found. Run fetch first.")
     else:
         print(u)
         print("\n[OK] Wrote data/active_symbols.csv")
+
+if __name__ == "__main__":
+    main()
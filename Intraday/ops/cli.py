@@ -0,0 +1,128 @@
+# ops/cli.py
+# Single entry point: python -m ops <command> [args]
+#
+# Only the stdlib is imported here; each command's module (and with it pandas,
+# kiteconnect, yaml, ...) is imported when that command runs. If a worker
+# started with `python -m ops worker` is listening on the socket, commands are
+# forwarded to it and run against its warm Kite session and bar caches.
+from __future__ import annotations
+import argparse, json, os, socket, stat, sys
+
+COMMANDS = {
+    "fetch":    ("ops.fetch_intraday",    "fetch 1-min bars from Kite (today / --yesterday / --date)"),
+    "universe": ("ops.build_universe",    "rank raw symbols and write data/active_symbols.csv"),
+    "signals":  ("ops.run_baseline",      "write meanrev signals for the active universe"),
+    "backtest": ("ops.backtest_baseline", "backtest saved signals, write equity curves"),
+    "tune":     ("ops.tune_baseline",     "grid-search meanrev params per symbol"),
+    "results":  ("ops.query_results",     "query the results store"),
+}
+def _default_socket() -> str:
+    # per-user location: $XDG_RUNTIME_DIR is private to the user; else a uid-named file in TMPDIR
+    run_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if run_dir:
+        return os.path.join(run_dir, "intraday-worker.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else ""
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"intraday-worker-{uid}.sock")
+
+DEFAULT_SOCKET = os.environ.get("INTRADAY_SOCKET") or _default_socket()
+
+CONNECT_TIMEOUT = 2.0
+
+def run_command(command: str, argv: list[str]) -> int:
+    import importlib
+    mod = importlib.import_module(COMMANDS[command][0])
+    try:
+        mod.main(argv, prog=f"python -m ops {command}")
+    except SystemExit as e:
+        if isinstance(e.code, int) or e.code is None:
+            return e.code or 0
+        print(e.code, file=sys.stderr)   # sys.exit("message")
+        return 1
+    return 0
+
+# -------- Worker client --------
+def owned_socket(sock_path: str) -> bool:
+    # only talk to (or remove) a socket our own user created; lstat so a symlink does not count
+    st = os.lstat(sock_path)
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+def connect(sock_path: str) -> socket.socket | None:
+    if not hasattr(socket, "AF_UNIX") or not os.path.lexists(sock_path):
+        return None
+    if not owned_socket(sock_path):
+        print(f"[WARN] {sock_path} is not a socket owned by this user; ignoring it", file=sys.stderr)
+        return None
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.settimeout(CONNECT_TIMEOUT)
+    try:
+        s.connect(sock_path)
+        s.settimeout(None)   # commands may run for minutes
+    except OSError:
+        s.close()   # stale socket file, nobody listening
+        return None
+    return s
+
+def request(s: socket.socket, msg: dict) -> int | None:
+    # protocol: one JSON line in; JSON lines {"out": ...} streamed back, then {"exit": code}.
+    # {"stale": [files]} instead means the worker's loaded code no longer matches
+    # the files on disk and it is exiting; {"busy": true} means another command is
+    # running. Either way it did not run this one (None -> run locally).
+    with s, s.makefile("rwb") as f:
+        f.write(json.dumps(msg).encode() + b"\n")
+        f.flush()
+        for line in f:
+            m = json.loads(line)
+            if "out" in m:
+                sys.stdout.write(m["out"]); sys.stdout.flush()
+            elif "exit" in m:
+                return m["exit"]
+            elif "busy" in m:
+                print("[INFO] worker is busy, running locally", file=sys.stderr)
+                return None
+            elif "stale" in m:
+                print(f"[WARN] worker code is out of date ({', '.join(m['stale'])} changed); "
+                      "worker is exiting, running locally", file=sys.stderr)
+                return None
+    print("[ERR] worker closed the connection", file=sys.stderr)
+    return 1
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(prog="python -m ops", description="Intraday pipeline commands.",
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                epilog="commands:\n" + "\n".join(f"  {k:<9} {h}" for k, (_, h) in COMMANDS.items())
+                                       + "\n  worker    run/stop/query the warm worker (see: worker --help)")
+    p.add_argument("--socket", default=DEFAULT_SOCKET, help="worker socket path (env INTRADAY_SOCKET)")
+    p.add_argument("--no-worker", action="store_true", help="run in this process even if a worker is up")
+    p.add_argument("command", choices=[*COMMANDS, "worker"], metavar="command")
+    p.add_argument("args", nargs=argparse.REMAINDER, help="passed to the command (try: <command> --help)")
+    args = p.parse_args(argv)
+
+    # --no-worker / --socket may also come after the command name
+    rest, it = [], iter(args.args)
+    for a in it:
+        if a == "--no-worker":
+            args.no_worker = True
+        elif a == "--socket":
+            args.socket = next(it, None) or p.error("--socket expects a path")
+        elif a.startswith("--socket="):
+            args.socket = a.split("=", 1)[1]
+        else:
+            rest.append(a)
+    args.args = rest
+    return args
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.command == "worker":
+        from ops.worker import main as worker_main
+        return worker_main(args.args, sock_path=args.socket)
+
+    s = None if args.no_worker else connect(args.socket)
+    if s is not None:
+        code = request(s, {"cwd": os.getcwd(), "command": args.command, "argv": args.args})
+        if code is not None:
+            return code
+    return run_command(args.command, args.args)
+
+if __name__ == "__main__":
+    sys.exit(main())
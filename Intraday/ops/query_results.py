@@ -0,0 +1,56 @@
+# ops/query_results.py
+from __future__ import annotations
+import argparse, importlib, json, os, sys
+import pandas as pd
+
+if not __package__:   # run as a script
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.results_db import ResultsDB
+
+# module that evaluates each strategy; its current_code_version() scopes "best params"
+# and its PARAM_DEFAULTS complete a partial --params
+STRATEGIES = {
+    "meanrev": "ops.tune_baseline",
+    "signals_file": "ops.backtest_baseline",
+}
+
+def json_params(s: str) -> dict:
+    try:
+        v = json.loads(s)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"not valid JSON ({e})")
+    if not isinstance(v, dict):
+        raise argparse.ArgumentTypeError("expected a JSON object")
+    return v
+
+def parse_args(argv=None, prog=None):
+    p = argparse.ArgumentParser(prog=prog, description="Query the backtest/tuning results store.")
+    p.add_argument("--strategy", default="meanrev", choices=list(STRATEGIES))
+    p.add_argument("--symbol", type=str, help="restrict to one symbol")
+    p.add_argument("--params", type=json_params,
+                   help='show history of one param set instead of best params, e.g. \'{"win": 20, "z": 1.5}\'')
+    p.add_argument("--all-code", action="store_true",
+                   help="best params: include rows from older code versions")
+    p.add_argument("--all-data", action="store_true",
+                   help="best params: include older data ranges, not just the latest per symbol")
+    return p.parse_args(argv)
+
+def main(argv=None, prog=None):
+    args = parse_args(argv, prog)
+    mod = importlib.import_module(STRATEGIES[args.strategy])
+    with ResultsDB() as db:
+        if args.params:
+            df = db.history(args.strategy, {**mod.PARAM_DEFAULTS, **args.params}, symbol=args.symbol)
+        else:
+            code = None if args.all_code else mod.current_code_version()
+            df = db.best_params(args.strategy, symbol=args.symbol, code=code, latest_data=not args.all_data)
+        stored = db.count()
+    if df.empty:
+        print("[INFO] no results stored yet" if not stored else f"[INFO] no results match ({stored} rows stored)")
+        return
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(df.drop(columns=["id"]))
+
+if __name__ == "__main__":
+    main()
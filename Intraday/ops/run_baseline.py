@@ -1,14 +1,19 @@
 # ops/run_baseline.py
 from __future__ import annotations
+import argparse, os, sys
 from pathlib import Path
 import pandas as pd
 
+if not __package__:   # run as a script
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 from src.signals import load_3min, signal_meanrev, save_model
 from src.universe import OUT as UNIVERSE_CSV
 
-def main():
+def main(argv=None, prog=None):
+    argparse.ArgumentParser(prog=prog, description="Write meanrev signals for the active universe.").parse_args(argv)
     if not Path(UNIVERSE_CSV).exists():
-        print("[WARN] active_symbols.csv not found. Run ops/build_universe.py")
+        print("[WARN] active_symbols.csv not found. Run `python -m ops universe`")
         return
 
     u = pd.read_csv(UNIVERSE_CSV)["symbol"].tolist()
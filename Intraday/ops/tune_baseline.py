@@ -1,27 +1,94 @@
 # ops/tune_baseline.py
-import os, sys
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
+import argparse, hashlib, os, sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
+
+if not __package__:   # run as a script
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import src.backtest
 from src.signals import signal_meanrev, load_model, save_model, load_3min
-from src.backtest import backtest_symbol, metrics
+from src.backtest import backtest_symbol, day_stats, metrics_from_days
+from src.results_db import ResultsDB, code_version, data_hash
+from src.utils import zscore
 
 UNIVERSE_CSV = Path("data/active_symbols.csv")
 OUT = Path("data/processed/tuning")
-OUT.mkdir(parents=True, exist_ok=True)
 
 WINS = [10, 20, 30, 40]
 ZTHS = [1.0, 1.5, 2.0]
+QTY = 15
+STRATEGY = "meanrev"
+PARAM_DEFAULTS = {"qty_per_trade": QTY}   # filled in by query_results --params
+
+def current_code_version() -> str:
+    # only what produces the numbers; constants read via the module so a worker sees what it loaded
+    return code_version(evaluate, signal_meanrev, zscore, backtest_symbol, day_stats, metrics_from_days,
+                        TCOST_BPS=src.backtest.TCOST_BPS, DAILY_STOP=src.backtest.DAILY_STOP,
+                        CAPITAL=src.backtest.CAPITAL)
+
+def split_days(df: pd.DataFrame) -> tuple:
+    # (day labels, first row, end row, per-row hashes) of a datetime-sorted panel;
+    # rows are hashed once per symbol and reused for every param set
+    d = df["datetime"].dt.date
+    starts = np.flatnonzero(d.ne(d.shift()).to_numpy())
+    stops = np.append(starts[1:], len(df))
+    row_h = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return d.iloc[starts].astype(str).tolist(), starts, stops, row_h
 
-def main():
+def evaluate(db: ResultsDB, sym: str, df: pd.DataFrame, days: tuple, params: dict, code: str) -> tuple[dict, int, int]:
+    # range metrics for one param set, built from per-day results: the leading
+    # days already in the store are reused, the rest run in one backtest pass.
+    # Returns (metrics, days evaluated, days reused).
+    labels, starts, stops, row_h = days
+    warm = params["win"]   # zscore on a day's first bar looks back `win` closes
+
+    def day_hash(i: int, carry: float) -> str:
+        # the day's bars, its warm-up bars and the position carried into it
+        lo = max(0, starts[i] - warm)
+        return f"{hashlib.sha1(row_h[lo:stops[i]].tobytes()).hexdigest()[:16]}:{carry:+.0f}"
+
+    cached = db.get_days(sym, STRATEGY, params, code)
+    rows, carry, i = [], 0.0, 0
+    while i < len(labels):
+        st = cached.get(day_hash(i, carry))
+        if st is None:
+            break
+        rows.append(st)
+        carry = st["carry_out"]
+        i += 1
+    n_cached = i
+
+    if i < len(labels):
+        lo = max(0, starts[i] - warm)
+        n_warm = starts[i] - lo
+        sig = signal_meanrev(df.iloc[lo:], win=params["win"], z=params["z"])
+        # replay the position carried in from earlier days through the warm-up bars
+        col = sig.columns.get_loc("signal")
+        sig.iloc[:n_warm, col] = 0.0
+        if n_warm:
+            sig.iloc[n_warm - 1, col] = carry
+        bt = backtest_symbol(sig, qty_per_trade=params["qty_per_trade"])
+        new = day_stats(bt.iloc[n_warm:], carry_in=carry)
+        carries = [carry] + [st["carry_out"] for st in new[:-1]]
+        db.put_days(sym, STRATEGY, params, code,
+                    [(labels[j], day_hash(j, c), st) for j, c, st in zip(range(i, len(labels)), carries, new)])
+        rows.extend(new)
+    return metrics_from_days(rows), len(labels) - n_cached, n_cached
+
+def main(argv=None, prog=None):
+    argparse.ArgumentParser(prog=prog, description="Grid-search meanrev params per symbol.").parse_args(argv)
     if not UNIVERSE_CSV.exists():
         print("[WARN] run universe builder first"); return
     syms = pd.read_csv(UNIVERSE_CSV)["symbol"].tolist()
     if not syms:
         print("[WARN] empty universe"); return
 
+    db = ResultsDB()
+    code = current_code_version()
     summary_rows = []
+    n_new = n_cached = days_new = days_cached = 0
     for sym in syms:
         df = load_3min(sym)
         if df.empty:
@@ -30,12 +97,22 @@ def main():
 
         best = None
         best_row = None
+        df = df.sort_values("datetime").reset_index(drop=True)
+        dhash = data_hash(df)
+        days = split_days(df)
 
         for w in WINS:
             for z in ZTHS:
-                df_sig = signal_meanrev(df, win=w, z=z)
-                bt = backtest_symbol(df_sig, qty_per_trade=15)
-                m = metrics(bt)
+                params = {"win": w, "z": z, "qty_per_trade": QTY}
+                # skip combinations already evaluated on this data with this code;
+                # otherwise only days not yet in the store are run
+                m = db.get(sym, dhash, STRATEGY, params, code)
+                if m is None:
+                    m, dn, dc = evaluate(db, sym, df, days, params, code)
+                    db.put(sym, dhash, STRATEGY, params, code, m, data=df)
+                    n_new += 1; days_new += dn; days_cached += dc
+                else:
+                    n_cached += 1
                 row = {"symbol": sym, "win": w, "z": z, **m}
                 summary_rows.append(row)
                 # choose by net pnl then sharpe
@@ -49,7 +126,11 @@ def main():
             save_model(sym, {"win": int(best_row["win"]), "z": float(best_row["z"])})
             print(f"[OK] {sym}: best -> win={best_row['win']}, z={best_row['z']}, pnl={best_row['net_pnl']}")
 
+    db.close()
+    print(f"[INFO] evaluated {n_new} new ({days_new} new days, {days_cached} cached days), reused {n_cached} cached")
+
     if summary_rows:
+        OUT.mkdir(parents=True, exist_ok=True)
         pd.DataFrame(summary_rows).to_csv(OUT / "tuning_results.csv", index=False)
         print(f"\n[OK] wrote {OUT/'tuning_results.csv'}")
 
@@ -0,0 +1,178 @@
+# ops/worker.py
+# Long-lived local worker behind a Unix socket. Commands forwarded by ops.cli
+# run in this process, so pandas/kiteconnect are imported once and the Kite
+# session (src.broker), the instrument master and recently read bar panels
+# (src.utils.read_csv_cached) stay warm between invocations. One command runs
+# at a time; a request that arrives meanwhile is answered "busy" and the client
+# runs it locally instead of queueing. Modules are never reloaded: if a loaded
+# src/ or ops/ file changes on disk, the worker hands the command back and exits.
+from __future__ import annotations
+import argparse, contextlib, json, os, socket, socketserver, sys, threading, time, traceback
+
+from ops.cli import COMMANDS, connect, owned_socket, request, run_command
+
+class _SocketWriter:
+    # file-like stdout/stderr that streams to the client; a client that went
+    # away must not abort the command (e.g. a cron job killed mid-tune)
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.alive = True
+
+    def send(self, msg: dict):
+        if not self.alive:
+            return
+        try:
+            self.wfile.write(json.dumps(msg).encode() + b"\n")
+            self.wfile.flush()
+        except OSError:
+            self.alive = False
+
+    def write(self, text: str) -> int:
+        if text:
+            self.send({"out": text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        out = _SocketWriter(self.wfile)
+        try:
+            req = json.loads(self.rfile.readline())
+        except ValueError:
+            out.send({"out": "[ERR] bad request\n"}); out.send({"exit": 2})
+            return
+        cmd = req.get("command")
+        if cmd == "__stop__":
+            out.send({"out": "[OK] worker stopping\n"}); out.send({"exit": 0})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if cmd == "__status__":
+            out.send({"out": self.server.status()}); out.send({"exit": 0})
+            return
+        if cmd not in COMMANDS:
+            out.send({"out": f"[ERR] unknown command {cmd!r}\n"}); out.send({"exit": 2})
+            return
+        if not self.server.running.acquire(blocking=False):
+            out.send({"busy": True})
+            return
+        try:
+            self.run(out, req)
+        finally:
+            self.server.running.release()
+
+    def run(self, out: _SocketWriter, req: dict):
+        stale = self.server.stale()
+        if stale:
+            out.send({"stale": stale})
+            print(f"[WARN] code changed on disk ({', '.join(stale)}); exiting")
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+
+        # stdout/stderr are process-wide; safe because only one command runs at a time
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+            try:
+                os.chdir(req["cwd"])   # ops scripts use paths relative to the repo dir
+                code = run_command(req["command"], list(req.get("argv", [])))
+            except Exception:
+                traceback.print_exc()
+                code = 1
+        self.server.served += 1
+        self.server.snapshot()
+        out.send({"exit": code})
+
+class WorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    # a thread per connection so status/stop/busy replies are not stuck behind a
+    # long command; server_close() waits for a running command to finish
+    def __init__(self, sock_path: str):
+        super().__init__(sock_path, _Handler)
+        os.chmod(sock_path, 0o600)   # commands run with our credentials
+        self.running = threading.Lock()
+        self.started = time.time()
+        self.served = 0
+        self.mtimes: dict[str, int] = {}
+        self.snapshot()
+
+    @staticmethod
+    def _our_files() -> list[str]:
+        files = []
+        for name, mod in list(sys.modules.items()):
+            f = getattr(mod, "__file__", None)
+            if f and name.split(".")[0] in ("src", "ops"):
+                files.append(f)
+        return files
+
+    def snapshot(self):
+        # remember mtimes of src/ops modules as they get imported
+        for f in self._our_files():
+            if f not in self.mtimes:
+                with contextlib.suppress(OSError):
+                    self.mtimes[f] = os.stat(f).st_mtime_ns
+
+    def stale(self) -> list[str]:
+        out = []
+        for f, m in self.mtimes.items():
+            try:
+                changed = os.stat(f).st_mtime_ns != m
+            except OSError:
+                changed = True
+            if changed:
+                out.append(os.path.relpath(f))
+        return out
+
+    def status(self) -> str:
+        mods = [m for m in ("pandas", "kiteconnect", "src.broker") if m in sys.modules]
+        panels = len(sys.modules["src.utils"]._csv_cache) if "src.utils" in sys.modules else 0
+        kite = "src.broker" in sys.modules and sys.modules["src.broker"]._kite is not None
+        return (f"[OK] worker pid={os.getpid()} up={time.time() - self.started:.0f}s "
+                f"served={self.served} kite_session={kite} cached_panels={panels} "
+                f"loaded={','.join(mods) or '-'}\n")
+
+def preload(broker: bool):
+    import pandas  # noqa: F401
+    import src.signals, src.backtest  # noqa: F401
+    if broker:
+        from src.broker import load_kite, instruments_df
+        instruments_df(load_kite())
+        print("[INFO] Kite session and instrument master loaded")
+
+def serve(sock_path: str, broker: bool = False) -> int:
+    s = connect(sock_path)
+    if s is not None:
+        s.close()
+        print(f"[WARN] a worker is already listening on {sock_path}"); return 1
+    if os.path.lexists(sock_path):
+        if not owned_socket(sock_path):
+            print(f"[ERR] {sock_path} exists and is not our socket; pick another path with --socket"); return 1
+        os.unlink(sock_path)   # stale file from a worker that did not exit cleanly
+    preload(broker)
+    with WorkerServer(sock_path) as server:
+        print(f"[OK] worker listening on {sock_path} (pid {os.getpid()})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(sock_path)
+    print("[INFO] worker stopped")
+    return 0
+
+def main(argv=None, sock_path: str = "") -> int:
+    p = argparse.ArgumentParser(prog="python -m ops worker",
+                                description="Keep a warm worker on a Unix socket (runs in the foreground).")
+    g = p.add_mutually_exclusive_group()
+    g.add_argument("--stop", action="store_true", help="ask a running worker to exit")
+    g.add_argument("--status", action="store_true", help="show whether a worker is up and what it holds")
+    p.add_argument("--broker", action="store_true", help="log in to Kite and load instruments at start")
+    args = p.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("[ERR] Unix sockets are not available on this platform"); return 1
+    if args.stop or args.status:
+        s = connect(sock_path)
+        if s is None:
+            print(f"[INFO] no worker on {sock_path}"); return 1 if args.status else 0
+        return request(s, {"command": "__stop__" if args.stop else "__status__"})
+    return serve(sock_path, broker=args.broker)
@@ -57,3 +57,47 @@ def metrics(df: pd.DataFrame) -> dict:
         "daily_sharpe": round(float(sharpe), 2),
         "max_drawdown": round(float(mdd), 2),
     }
+
+# -------- Per-day pieces of metrics() --------
+def day_stats(df: pd.DataFrame, carry_in: float = 0.0) -> list[dict]:
+    # backtest_symbol output (datetime-sorted) -> one row per trading day;
+    # carry_out is the position held into the next day
+    day = df["datetime"].dt.tz_localize(None).to_numpy().astype("datetime64[D]")   # local trading date
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    stops = np.r_[starts[1:], len(df)]
+    pnl = df["pnl"].to_numpy(dtype=float)
+    sig = df["signal"].fillna(0).to_numpy(dtype=float)
+    rows, carry = [], float(carry_in)
+    for a, b in zip(starts, stops):
+        cum = pnl[a:b].cumsum()
+        nz = sig[a:b][sig[a:b] != 0]
+        if nz.size:
+            carry = float(nz[-1])
+        rows.append({
+            "trades": int(nz.size),
+            "pnl": float(cum[-1]),
+            "peak": float(cum.max()),
+            "trough": float(cum.min()),
+            "max_drawdown": float((np.maximum.accumulate(cum) - cum).max()),
+            "carry_out": carry,
+        })
+    return rows
+
+def metrics_from_days(days: list[dict]) -> dict:
+    # same numbers as metrics() on the whole range, from day_stats() rows in date order
+    if not days:
+        return metrics(pd.DataFrame())
+    pnl = np.array([d["pnl"] for d in days])
+    eq = np.cumsum(pnl)
+    eq_before = np.r_[0.0, eq[:-1]]
+    peaks = np.maximum.accumulate(eq_before + np.array([d["peak"] for d in days]))
+    dd_across = np.r_[-np.inf, peaks[:-1]] - (eq_before + np.array([d["trough"] for d in days]))
+    mdd = max(0.0, max(d["max_drawdown"] for d in days), float(dd_across.max()))
+    daily = pd.Series(pnl)
+    sharpe = 0.0 if daily.std(ddof=1) == 0 else (daily.mean() / daily.std(ddof=1)) * np.sqrt(252)
+    return {
+        "trades": int(sum(d["trades"] for d in days)),
+        "net_pnl": round(float(eq[-1]), 2),
+        "daily_sharpe": round(float(sharpe), 2),
+        "max_drawdown": round(mdd, 2),
+    }
@@ -0,0 +1,94 @@
+# src/broker.py
+from __future__ import annotations
+from datetime import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+import pandas as pd
+
+if TYPE_CHECKING:
+    from kiteconnect import KiteConnect
+
+SECRETS = Path("config/secrets.yaml")
+
+# session / instrument master are cached per process so a long-lived worker
+# logs in once and re-logs in only when get_access_token rewrites secrets.yaml
+_kite: tuple[tuple, KiteConnect] | None = None
+_instruments: dict[tuple, pd.DataFrame] = {}
+
+# -------- Auth / setup --------
+def load_kite() -> KiteConnect:
+    global _kite
+    p = SECRETS.resolve()
+    key = (str(p), p.stat().st_mtime_ns)
+    if _kite is None or _kite[0] != key:
+        import yaml
+        from kiteconnect import KiteConnect
+        with open(p) as f:
+            sec = yaml.safe_load(f)
+        kite = KiteConnect(api_key=sec["kite"]["api_key"])
+        kite.set_access_token(sec["kite"]["access_token"])
+        _kite = (key, kite)
+    return _kite[1]
+
+def instruments_df(kite: KiteConnect) -> pd.DataFrame:
+    # instrument master changes at most daily (new expiries)
+    key = (id(kite), pd.Timestamp.today().date())
+    if key not in _instruments:
+        _instruments.clear()
+        _instruments[key] = pd.DataFrame(kite.instruments())
+    return _instruments[key]
+
+# -------- Instrument resolvers --------
+def resolve_equity(df: pd.DataFrame, symbol_dotns: str) -> int:
+    sym = symbol_dotns.replace(".NS", "")
+    row = df[(df.exchange == "NSE") & (df.tradingsymbol == sym)]
+    if row.empty: raise ValueError(f"Equity not found: {symbol_dotns}")
+    return int(row.iloc[0].instrument_token)
+
+def resolve_frontmonth_future(df: pd.DataFrame, index_name: str) -> tuple[int, str]:
+    # index_name: "NIFTY" or "BANKNIFTY"
+    nfo = df[(df.exchange == "NFO") & (df.segment == "NFO-FUT") & (df.name == index_name)].copy()
+    if nfo.empty: raise ValueError(f"No futures rows for {index_name}")
+    nfo["expiry"] = pd.to_datetime(nfo["expiry"])
+    today = pd.Timestamp.today().normalize()
+    row = nfo[nfo.expiry >= today].sort_values("expiry").iloc[0]
+    return int(row.instrument_token), str(row.tradingsymbol)
+
+# -------- Time windows (IST) --------
+def _ist_day_window(date: pd.Timestamp):
+    tz = "Asia/Kolkata"
+    d = date.tz_localize(tz).date()
+    start = pd.Timestamp.combine(d, time(9, 15)).tz_localize(tz).tz_localize(None)
+    end   = pd.Timestamp.combine(d, time(15, 30)).tz_localize(tz).tz_localize(None)
+    return start, end
+
+def ist_today_window():
+    return _ist_day_window(pd.Timestamp.now(tz="Asia/Kolkata"))
+
+def ist_yesterday_window():
+    return _ist_day_window(pd.Timestamp.now(tz="Asia/Kolkata") - pd.Timedelta(days=1))
+
+def ist_date_window(date_str: str):
+    # date_str: "YYYY-MM-DD"
+    return _ist_day_window(pd.Timestamp(date_str, tz="Asia/Kolkata"))
+
+# -------- Fetch / resample --------
+def fetch_1min(kite: KiteConnect, token: int, start, end) -> pd.DataFrame:
+    try:
+        candles = kite.historical_data(token, start, end, interval="minute", continuous=False, oi=False)
+        if not candles:
+            print(f"[DEBUG] 0 rows for token {token} {start} -> {end}")
+            return pd.DataFrame()
+        df = pd.DataFrame(candles).rename(columns={"date": "datetime"})
+        df["datetime"] = pd.to_datetime(df["datetime"])
+        return df[["datetime","open","high","low","close","volume"]]
+    except Exception as e:
+        print(f"[DEBUG] historical_data error token {token}: {e}")
+        return pd.DataFrame()
+
+def to_3min(df: pd.DataFrame) -> pd.DataFrame:
+    o = (df.set_index("datetime").sort_index()
+           .resample("3min")
+           .agg({"open":"first","high":"max","low":"min","close":"last","volume":"sum"})
+           .dropna())
+    return o.reset_index()
@@ -0,0 +1,224 @@
+# src/results_db.py
+from __future__ import annotations
+import hashlib, inspect, json, sqlite3
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+
+DB_PATH = Path("data/results.sqlite")
+METRIC_COLS = ["trades", "net_pnl", "daily_sharpe", "max_drawdown"]
+DAY_COLS = ["trades", "pnl", "peak", "trough", "max_drawdown", "carry_out"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id           INTEGER PRIMARY KEY,
+    symbol       TEXT NOT NULL,
+    data_hash    TEXT NOT NULL,
+    strategy     TEXT NOT NULL,
+    params       TEXT NOT NULL,
+    code_version TEXT NOT NULL,
+    data_start   TEXT,
+    data_end     TEXT,
+    n_bars       INTEGER,
+    trades       INTEGER,
+    net_pnl      REAL,
+    daily_sharpe REAL,
+    max_drawdown REAL,
+    created_at   TEXT NOT NULL,
+    UNIQUE (symbol, data_hash, strategy, params, code_version)
+);
+-- "best params per symbol"
+CREATE INDEX IF NOT EXISTS ix_results_best
+    ON results (strategy, symbol, net_pnl DESC, daily_sharpe DESC);
+-- "history of this param set"
+CREATE INDEX IF NOT EXISTS ix_results_params
+    ON results (strategy, params, created_at);
+
+-- one trading day of one evaluation; day_hash covers the day's bars, the
+-- warm-up bars before it and the position carried in, so a range result can
+-- be rebuilt from days already evaluated (see src.backtest.metrics_from_days)
+CREATE TABLE IF NOT EXISTS day_results (
+    symbol       TEXT NOT NULL,
+    day          TEXT NOT NULL,
+    day_hash     TEXT NOT NULL,
+    strategy     TEXT NOT NULL,
+    params       TEXT NOT NULL,
+    code_version TEXT NOT NULL,
+    trades       INTEGER,
+    pnl          REAL,
+    peak         REAL,
+    trough       REAL,
+    max_drawdown REAL,
+    carry_out    REAL,
+    created_at   TEXT NOT NULL,
+    PRIMARY KEY (symbol, day_hash, strategy, params, code_version)
+);
+
+-- files written from a result (e.g. equity curves), with the result key they
+-- were written for, so a cached result is only reused if its file matches
+CREATE TABLE IF NOT EXISTS outputs (
+    path       TEXT PRIMARY KEY,
+    result_key TEXT NOT NULL,
+    mtime_ns   INTEGER NOT NULL
+);
+"""
+
+# -------- Key components --------
+def _norm(v):
+    # 2.0 and 2 are the same param value; numpy scalars become plain Python numbers
+    if hasattr(v, "item"):
+        v = v.item()
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+def params_key(params: dict) -> str:
+    # canonical JSON so {"z": 1.5, "win": 20} and {"win": 20, "z": 1.5} hit the same row
+    return json.dumps({k: _norm(params[k]) for k in sorted(params)}, separators=(",", ":"))
+
+def data_hash(df: pd.DataFrame) -> str:
+    h = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+def _code_bytes(co) -> bytes:
+    parts = [co.co_code, repr(co.co_names).encode()]
+    for c in co.co_consts:
+        parts.append(_code_bytes(c) if inspect.iscode(c) else repr(c).encode())
+    return b"".join(parts)
+
+def _fn_bytes(fn) -> bytes:
+    return _code_bytes(fn.__code__) + repr((fn.__defaults__, fn.__kwdefaults__)).encode()
+
+def code_version(*fns, **consts) -> str:
+    # hash of the code actually loaded (bytecode + defaults) of the functions
+    # that produce the numbers, plus the constants they read. Not the source on
+    # disk: a long-lived worker may be running an older import. Callers list
+    # only what affects results, so editing a log line does not drop the cache.
+    h = hashlib.sha1()
+    for fn in fns:
+        h.update(fn.__qualname__.encode() + _fn_bytes(fn))
+    for name in sorted(consts):
+        h.update(f"{name}={consts[name]!r}".encode())
+    return h.hexdigest()[:12]
+
+# -------- Store --------
+class ResultsDB:
+    def __init__(self, path: str | Path = DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, symbol: str, dhash: str, strategy: str, params: dict, code: str) -> dict | None:
+        row = self.conn.execute(
+            f"SELECT {', '.join(METRIC_COLS)} FROM results "
+            "WHERE symbol=? AND data_hash=? AND strategy=? AND params=? AND code_version=?",
+            (symbol, dhash, strategy, params_key(params), code),
+        ).fetchone()
+        if row is None:
+            return None
+        # SQLite stores NaN as NULL; hand back NaN so comparisons behave like fresh metrics
+        return {k: (float("nan") if row[k] is None else row[k]) for k in METRIC_COLS}
+
+    def put(self, symbol: str, dhash: str, strategy: str, params: dict, code: str,
+            metrics: dict, data: pd.DataFrame | None = None):
+        span = (None, None, None)
+        if data is not None and not data.empty:
+            span = (str(data["datetime"].min()), str(data["datetime"].max()), len(data))
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (symbol, data_hash, strategy, params, code_version, "
+                "data_start, data_end, n_bars, trades, net_pnl, daily_sharpe, max_drawdown, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (symbol, dhash, strategy, params_key(params), code, *span,
+                 *(metrics.get(c) for c in METRIC_COLS),
+                 datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def get_days(self, symbol: str, strategy: str, params: dict, code: str) -> dict[str, dict]:
+        # every stored day of one param set, keyed by day_hash
+        rows = self.conn.execute(
+            f"SELECT day_hash, {', '.join(DAY_COLS)} FROM day_results "
+            "WHERE symbol=? AND strategy=? AND params=? AND code_version=?",
+            (symbol, strategy, params_key(params), code),
+        ).fetchall()
+        return {r["day_hash"]: {c: r[c] for c in DAY_COLS} for r in rows}
+
+    def put_days(self, symbol: str, strategy: str, params: dict, code: str,
+                 days: list[tuple[str, str, dict]]):
+        # days: (day, day_hash, stats) rows, written in one transaction
+        pk, now = params_key(params), datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO day_results (symbol, day, day_hash, strategy, params, code_version, "
+                "trades, pnl, peak, trough, max_drawdown, carry_out, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(symbol, day, dh, strategy, pk, code, int(st["trades"]),
+                  *(float(st[c]) for c in DAY_COLS[1:]), now) for day, dh, st in days],
+            )
+
+    def output_matches(self, path: str | Path, key: str) -> bool:
+        p = Path(path).resolve()
+        row = self.conn.execute("SELECT result_key, mtime_ns FROM outputs WHERE path=?", (str(p),)).fetchone()
+        return (row is not None and p.exists()
+                and row["result_key"] == key and row["mtime_ns"] == p.stat().st_mtime_ns)
+
+    def set_output(self, path: str | Path, key: str):
+        p = Path(path).resolve()
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO outputs (path, result_key, mtime_ns) VALUES (?, ?, ?)",
+                              (str(p), key, p.stat().st_mtime_ns))
+
+    # -------- Queries --------
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def best_params(self, strategy: str, symbol: str | None = None,
+                    code: str | None = None, latest_data: bool = True) -> pd.DataFrame:
+        # best row per symbol, ranked by net pnl then sharpe (same rule as the tuner).
+        # code: only rows from this code version (None = any).
+        # latest_data: only the most recent data range per symbol, so an old
+        # range with a better pnl does not stay "best" forever.
+        where, args = "strategy = ?", [strategy]
+        if symbol:
+            where += " AND symbol = ?"; args.append(symbol)
+        if code:
+            where += " AND code_version = ?"; args.append(code)
+        scope = ""
+        if latest_data:
+            scope = f"""
+            AND (symbol, data_hash) IN (
+                SELECT symbol, data_hash FROM (
+                    SELECT symbol, data_hash, ROW_NUMBER() OVER (
+                        PARTITION BY symbol ORDER BY data_end DESC, n_bars DESC, created_at DESC
+                    ) AS rn
+                    FROM results WHERE {where}
+                ) WHERE rn = 1
+            )"""
+            args = args * 2
+        q = f"""
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY symbol ORDER BY net_pnl DESC, daily_sharpe DESC, created_at DESC
+            ) AS rn
+            FROM results WHERE {where}{scope}
+        ) WHERE rn = 1 ORDER BY symbol
+        """
+        return pd.read_sql_query(q, self.conn, params=args).drop(columns="rn")
+
+    def history(self, strategy: str, params: dict, symbol: str | None = None) -> pd.DataFrame:
+        where, args = "strategy = ? AND params = ?", [strategy, params_key(params)]
+        if symbol:
+            where += " AND symbol = ?"; args.append(symbol)
+        q = f"SELECT * FROM results WHERE {where} ORDER BY created_at"
+        return pd.read_sql_query(q, self.conn, params=args)
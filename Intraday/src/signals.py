@@ -2,13 +2,11 @@
 from __future__ import annotations
 import pandas as pd
 from pathlib import Path
-from joblib import dump, load
 
-from .utils import zscore
+from .utils import read_csv_cached, zscore
 
 PROC_DIR = Path("data/processed")
 MODEL_DIR = Path("models")
-MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
 def load_3min(symbol: str) -> pd.DataFrame:
     # choose latest 3-min file for the symbol (today or *_YDAY_3min.csv if you make those)
@@ -16,7 +14,7 @@ def load_3min(symbol: str) -> pd.DataFrame:
     cands = sorted(PROC_DIR.glob(f"{symbol}*_3min.csv")) or list(PROC_DIR.glob(f"{symbol}.csv"))
     if not cands:
         return pd.DataFrame()
-    return pd.read_csv(cands[-1], parse_dates=["datetime"])
+    return read_csv_cached(cands[-1], parse_dates=["datetime"])
 
 def signal_meanrev(df: pd.DataFrame, win: int = 20, z: float = 1.5) -> pd.DataFrame:
     if df.empty:
@@ -31,10 +29,13 @@ def signal_meanrev(df: pd.DataFrame, win: int = 20, z: float = 1.5) -> pd.DataFr
     return df
 
 def save_model(symbol: str, params: dict):
+    from joblib import dump
+    MODEL_DIR.mkdir(parents=True, exist_ok=True)
     dump(params, MODEL_DIR / f"{symbol}_meanrev.joblib")
 
 def load_model(symbol: str) -> dict | None:
     p = MODEL_DIR / f"{symbol}_meanrev.joblib"
     if p.exists():
+        from joblib import load
         return load(p)
     return None
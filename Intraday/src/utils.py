@@ -1,8 +1,12 @@
 from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
 import numpy as np
 import pandas as pd
 
 RANDOM_STATE = 42
+CSV_CACHE_SIZE = 32
+_csv_cache: OrderedDict = OrderedDict()
 
 def set_seed(seed:int = RANDOM_STATE):
     import random
@@ -18,3 +22,16 @@ def ensure_dt_index(df: pd.DataFrame, ts_col: str = "datetime") -> pd.DataFrame:
 def zscore(s: pd.Series, win: int) -> pd.Series:
     r = s.rolling(win)
     return (s - r.mean()) / (r.std(ddof=0) + 1e-9)
+
+def read_csv_cached(path: str | Path, **kw) -> pd.DataFrame:
+    # small LRU keyed on file identity; a long-lived worker reuses parsed panels until the file changes
+    p = Path(path).resolve()
+    st = p.stat()
+    key = (str(p), st.st_mtime_ns, st.st_size, repr(sorted(kw.items())))
+    if key in _csv_cache:
+        _csv_cache.move_to_end(key)
+    else:
+        _csv_cache[key] = pd.read_csv(p, **kw)
+        while len(_csv_cache) > CSV_CACHE_SIZE:
+            _csv_cache.popitem(last=False)
+    return _csv_cache[key].copy()